@@ -1,7 +1,9 @@
 from typing import Dict, Iterable, List, Union
+import logging
 import os
 
 import opensearchpy
+from opensearchpy import helpers
 
 from tasks import IndexInterface
 
@@ -53,6 +55,34 @@ class OpenSearchInterface(IndexInterface):
         index = self.get_index_name(index)
         self._search_engine.index(index=index, body=document, id=document_id, refresh=refresh)
 
+    def bulk_index(
+        self,
+        documents: List[Dict],
+        document_ids: List[str],
+        index: str = "",
+        refresh: bool = False,
+    ) -> List[str]:
+        index = self.get_index_name(index)
+        actions = (
+            {"_index": index, "_id": document_id, "_source": document}
+            for document, document_id in zip(documents, document_ids)
+        )
+        _, errors = helpers.bulk(
+            self._search_engine,
+            actions,
+            raise_on_error=False,
+            refresh=refresh,
+            request_timeout=self._timeout,
+        )
+        failed_ids = []
+        for error in errors:
+            for operation, result in error.items():
+                logging.warning(
+                    f"Could not {operation} document {result['_id']}: {result.get('error')}"
+                )
+                failed_ids.append(result["_id"])
+        return failed_ids
+
     def search(self, query: Dict, index: str = "") -> Dict:
         index = self.get_index_name(index)
         result = self._search_engine.search(index=index, body=query, request_timeout=60)
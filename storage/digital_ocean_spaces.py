@@ -4,6 +4,7 @@ from typing import Generator
 from io import BytesIO
 
 import boto3
+from botocore.config import Config
 
 from tasks import StorageInterface
 
@@ -28,6 +29,10 @@ def get_storage_bucket():
     return os.environ["STORAGE_BUCKET"]
 
 
+def get_storage_max_pool_connections():
+    return int(os.environ.get("STORAGE_MAX_POOL_CONNECTIONS", "10"))
+
+
 def create_storage_interface() -> StorageInterface:
     """
     Build an object to interact with the object storage
@@ -38,6 +43,7 @@ def create_storage_interface() -> StorageInterface:
         get_storage_access_key(),
         get_storage_access_secret(),
         get_storage_bucket(),
+        get_storage_max_pool_connections(),
     )
 
 
@@ -53,6 +59,7 @@ class DigitalOceanSpaces(StorageInterface):
         access_key: str,
         access_secret: str,
         bucket: str,
+        max_pool_connections: int = 10,
     ):
         self._region = region
         self._endpoint = endpoint
@@ -66,6 +73,7 @@ class DigitalOceanSpaces(StorageInterface):
             endpoint_url=self._endpoint,
             aws_access_key_id=self._access_key,
             aws_secret_access_key=self._access_secret,
+            config=Config(max_pool_connections=max_pool_connections),
         )
 
     def get_file(self, file_key: str, destination) -> None:
@@ -1,8 +1,8 @@
 import logging
-import tempfile
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from segmentation import get_segmenter
 
 from .interfaces import (
@@ -11,6 +11,7 @@ from .interfaces import (
     StorageInterface,
     TextExtractorInterface,
 )
+from .utils import TempFilePool
 
 
 def extract_text_from_gazettes(
@@ -20,66 +21,183 @@ def extract_text_from_gazettes(
     storage: StorageInterface,
     index: IndexInterface,
     text_extractor: TextExtractorInterface,
+    max_workers: Optional[int] = None,
+    bulk_size: int = 100,
 ) -> List[str]:
     """
     Extracts the text from a list of gazettes
+
+    The gazette files are downloaded and have their text extracted
+    concurrently by a pool of `max_workers` threads (defaults to the
+    TEXT_EXTRACTION_WORKERS variable), while the calling thread indexes the
+    results of the gazettes already done. The documents are sent to the index
+    in bulks of `bulk_size`, in the order the extractions finish, and, once
+    indexed, their gazettes are marked as processed in the database.
     """
     logging.info("Starting text extraction from gazettes")
 
+    if max_workers is None:
+        max_workers = get_text_extraction_workers()
+
     ids = []
-    for gazette in gazettes:
+    processed_gazettes = []
+    documents_count = 0
+    for gazette, result in process_gazette_files(
+        gazettes, territories, storage, text_extractor, max_workers
+    ):
         try:
-            document_ids = try_process_gazette_file(
-                gazette, territories, database, storage, index, text_extractor
-            )
+            gazette_documents = result.result()
         except Exception as e:
             logging.warning(
                 f"Could not process gazette: {gazette['file_path']}. Cause: {e}"
             )
             logging.exception(e)
         else:
-            ids.extend(document_ids)
+            processed_gazettes.append((gazette, gazette_documents))
+            documents_count += len(gazette_documents)
+            if documents_count >= bulk_size:
+                ids.extend(index_documents(processed_gazettes, database, index))
+                processed_gazettes = []
+                documents_count = 0
+
+    ids.extend(index_documents(processed_gazettes, database, index))
+    return ids
+
+
+def process_gazette_files(
+    gazettes: Iterable[Dict[str, Any]],
+    territories: Iterable[Dict[str, Any]],
+    storage: StorageInterface,
+    text_extractor: TextExtractorInterface,
+    max_workers: int,
+) -> Iterable[Tuple[Dict, Future]]:
+    """
+    Submits the gazettes to a pool of `max_workers` threads and yields each
+    one with the future holding its documents, as soon as it is done.
+
+    At most two gazettes per worker are in flight: the gazettes are only
+    pulled from the iterable as the results are consumed, so a long listing
+    is never loaded at once and the extracted texts do not pile up in memory
+    while the caller is busy indexing. Any finished gazette frees its slot,
+    so a slow one does not hold back the others.
+    """
+    with TempFilePool(max_workers) as tmpfiles, ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        processing = {}
+        for gazette in gazettes:
+            result = executor.submit(
+                try_process_gazette_file,
+                gazette,
+                territories,
+                tmpfiles,
+                storage,
+                text_extractor,
+            )
+            processing[result] = gazette
+            if len(processing) >= 2 * max_workers:
+                done, _ = wait(processing, return_when=FIRST_COMPLETED)
+                for result in done:
+                    yield processing.pop(result), result
+        while processing:
+            done, _ = wait(processing, return_when=FIRST_COMPLETED)
+            for result in done:
+                yield processing.pop(result), result
+
+
+def index_documents(
+    processed_gazettes: List[Tuple[Dict, List[Dict]]],
+    database: DatabaseInterface,
+    index: IndexInterface,
+) -> List[str]:
+    """
+    Sends the documents extracted from the gazettes to the index in a single
+    request and marks as processed the gazettes whose documents were all
+    indexed. If the request itself fails, none of the gazettes is marked as
+    processed.
+    """
+    documents = [
+        document
+        for _, gazette_documents in processed_gazettes
+        for document in gazette_documents
+    ]
+    failed_ids = set()
+    if len(documents) > 0:
+        try:
+            failed_ids = set(
+                index.bulk_index(
+                    documents, [document["file_checksum"] for document in documents]
+                )
+            )
+        except Exception as e:
+            logging.warning(f"Could not index {len(documents)} documents. Cause: {e}")
+            logging.exception(e)
+            return []
 
+    ids = []
+    for gazette, gazette_documents in processed_gazettes:
+        if any(
+            document["file_checksum"] in failed_ids for document in gazette_documents
+        ):
+            logging.warning(
+                f"Could not index gazette: {gazette['file_path']}. "
+                "Some of its documents were rejected"
+            )
+            continue
+        try:
+            set_gazette_as_processed(gazette, database)
+        except Exception as e:
+            logging.warning(
+                f"Could not set gazette as processed: {gazette['file_path']}. Cause: {e}"
+            )
+            logging.exception(e)
+        else:
+            ids.extend(document["file_checksum"] for document in gazette_documents)
     return ids
 
 
+def get_text_extraction_workers() -> int:
+    """
+    Get how many gazettes can be processed at the same time
+    """
+    return int(os.environ.get("TEXT_EXTRACTION_WORKERS", "4"))
+
+
 def try_process_gazette_file(
     gazette: Dict,
     territories: Iterable[Dict[str, Any]],
-    database: DatabaseInterface,
+    tmpfiles: TempFilePool,
     storage: StorageInterface,
-    index: IndexInterface,
     text_extractor: TextExtractorInterface,
-) -> Dict:
+) -> List[Dict]:
     """
-    Do all the work to extract the content from the gazette files
+    Do all the work to extract the content from the gazette files, returning
+    the documents to be indexed
     """
     logging.debug(f"Processing gazette {gazette['file_path']}")
-    gazette_file = download_gazette_file(gazette, storage)
-    gazette["source_text"] = try_to_extract_content(gazette_file, text_extractor)
+    gazette_file = tmpfiles.acquire()
+    try:
+        download_gazette_file(gazette, gazette_file, storage)
+        gazette["source_text"] = try_to_extract_content(gazette_file, text_extractor)
+    finally:
+        tmpfiles.release(gazette_file)
     gazette["url"] = define_file_url(gazette["file_path"])
     gazette_txt_path = define_gazette_txt_path(gazette)
     gazette["file_raw_txt"] = define_file_url(gazette_txt_path)
     upload_raw_text(gazette_txt_path, gazette["source_text"], storage)
-    delete_gazette_files(gazette_file)
 
-    document_ids = []
-    if gazette_type_is_aggregated(gazette):
-        segmenter = get_segmenter(gazette["territory_id"], territories)
-        territory_segments = segmenter.get_gazette_segments(gazette)
+    if not gazette_type_is_aggregated(gazette):
+        return [gazette]
+
+    segmenter = get_segmenter(gazette["territory_id"], territories)
+    territory_segments = segmenter.get_gazette_segments(gazette)
 
-        for segment in territory_segments:
-            segment_txt_path = define_segment_txt_path(segment)
-            segment["file_raw_txt"] = define_file_url(segment_txt_path)
-            upload_raw_text(segment_txt_path, segment["source_text"], storage)
-            index.index_document(segment, document_id=segment["file_checksum"])
-            document_ids.append(segment["file_checksum"])
-    else:
-        index.index_document(gazette, document_id=gazette["file_checksum"])
-        document_ids.append(gazette["file_checksum"])
+    for segment in territory_segments:
+        segment_txt_path = define_segment_txt_path(segment)
+        segment["file_raw_txt"] = define_file_url(segment_txt_path)
+        upload_raw_text(segment_txt_path, segment["source_text"], storage)
 
-    set_gazette_as_processed(gazette, database)
-    return document_ids
+    return territory_segments
 
 
 def gazette_type_is_aggregated(gazette: Dict):
@@ -137,32 +255,21 @@ def try_to_extract_content(
     gazette_file: str, text_extractor: TextExtractorInterface
 ) -> str:
     """
-    Calls the function to extract the content from the gazette file. If it fails
-    remove the gazette file and raise an exception
-    """
-    try:
-        return text_extractor.extract_text(gazette_file)
-    except Exception as e:
-        os.remove(gazette_file)
-        raise e
-
-
-def delete_gazette_files(gazette_file: str) -> None:
-    """
-    Removes the files used to process the gazette content.
+    Calls the function to extract the content from the gazette file
     """
-    os.remove(gazette_file)
+    return text_extractor.extract_text(gazette_file)
 
 
-def download_gazette_file(gazette: Dict, storage: StorageInterface) -> str:
+def download_gazette_file(
+    gazette: Dict, destination: str, storage: StorageInterface
+) -> None:
     """
     Download the file from the object storage and write it down in the local
     disk to allow the text extraction
     """
-    with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
+    with open(destination, "wb") as gazette_file:
         gazette_file_key = get_gazette_file_key_used_in_storage(gazette)
-        storage.get_file(gazette_file_key, tmpfile)
-        return tmpfile.name
+        storage.get_file(gazette_file_key, gazette_file)
 
 
 def get_gazette_file_key_used_in_storage(gazette: Dict) -> str:
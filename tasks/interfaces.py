@@ -1,4 +1,4 @@
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, List, Tuple
 import abc
 
 
@@ -82,6 +82,15 @@ class IndexInterface(abc.ABC):
         Upload document to the index
         """
 
+    @abc.abstractmethod
+    def bulk_index(
+        self, documents: List[Dict], document_ids: List[str], index: str, refresh: bool
+    ) -> List[str]:
+        """
+        Upload many documents to the index in a single request, returning the
+        ids of the documents which could not be indexed
+        """
+
     @abc.abstractmethod
     def search(self, query: Dict, index: str) -> Dict:
         """
@@ -5,6 +5,9 @@ from .index import (
 from .iter import (
     batched,
 )
+from .tempfile_pool import (
+    TempFilePool,
+)
 from .text import (
     clean_extra_whitespaces,
     get_checksum,
@@ -0,0 +1,68 @@
+import atexit
+import contextlib
+import os
+import queue
+import shutil
+import tempfile
+
+
+class TempFilePool:
+    """
+    Fixed set of temporary files reused to hold the gazettes being processed.
+
+    Released files are truncated instead of removed, so no file is created or
+    deleted per gazette. Everything lives in a single directory removed when
+    the pool is closed or, as a fallback, when the process exits.
+
+    Example
+    -------
+    >>> with TempFilePool(size=2) as pool:
+    ...     path = pool.acquire()
+    ...     # write and read the file in path
+    ...     pool.release(path)
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("size must be at least one")
+        self._directory = tempfile.mkdtemp(prefix="querido-diario-")
+        self._paths = queue.Queue()
+        for _ in range(size):
+            fd, path = tempfile.mkstemp(dir=self._directory)
+            os.close(fd)
+            self._paths.put(path)
+        atexit.register(self.close)
+
+    def acquire(self) -> str:
+        """
+        Returns the path of an empty file, waiting for one to be released if
+        all of them are in use
+        """
+        return self._paths.get()
+
+    def release(self, path: str) -> None:
+        """
+        Gives the file back to the pool, discarding its content. The file is
+        recreated if it cannot be truncated, and it always goes back to the
+        pool so no caller waits forever for it
+        """
+        try:
+            os.truncate(path, 0)
+        except OSError:
+            with contextlib.suppress(OSError), open(path, "wb"):
+                pass
+        finally:
+            self._paths.put(path)
+
+    def close(self) -> None:
+        """
+        Removes all files from the disk
+        """
+        shutil.rmtree(self._directory, ignore_errors=True)
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "TempFilePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
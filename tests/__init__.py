@@ -13,12 +13,17 @@ from .postgresql import (
     PostgreSQLConnectionTests,
     CreationDatabaseInterfaceFunctionTests,
 )
-from .text_extraction_task_tests import TextExtractionTaskTests
+from .text_extraction_task_tests import (
+    TextExtractionTaskFakeTests,
+    TextExtractionTaskUnitTests,
+    TextExtractionTaskIOTests,
+)
 
 from .main_tests import MainModuleTests
 
 from .opensearch import (
     OpensearchBasicTests,
+    OpensearchBulkIndexTests,
     IndexInterfaceFactoryFunctionTests,
     OpensearchIntegrationTests,
 )
@@ -42,6 +42,14 @@ class StorageInterfaceCreationTests(TestCase):
             )
             self.assertEqual("querido-diario", storage._bucket)
 
+    @patch.dict("os.environ", {"STORAGE_MAX_POOL_CONNECTIONS": "32"})
+    def test_storage_interface_connection_pool_size_from_environment(self):
+        with patch(
+            "boto3.Session.client",
+        ) as mock:
+            create_storage_interface()
+            self.assertEqual(32, mock.call_args.kwargs["config"].max_pool_connections)
+
 
 class DigitalOceanSpacesIntegrationTests(TestCase):
 
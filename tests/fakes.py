@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, List, Tuple, Union
+
+from tasks import (
+    DatabaseInterface,
+    IndexInterface,
+    StorageInterface,
+    TextExtractorInterface,
+)
+
+
+class CallRecorder:
+    """
+    Keeps the (name, args) of every call made to the fake, so tests can check
+    them without the bookkeeping overhead of a MagicMock
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def _record(self, name: str, *args) -> None:
+        self.calls.append((name, args))
+
+    def calls_to(self, name: str) -> List[Tuple]:
+        return [args for call_name, args in self.calls if call_name == name]
+
+
+class FakeDatabase(CallRecorder, DatabaseInterface):
+    def _commit_changes(self, command: str, data: Dict) -> None:
+        self._record("_commit_changes", command, data)
+
+    def select(self, command: str) -> Iterable[Tuple]:
+        self._record("select", command)
+        return []
+
+    def insert(self, command: str, data: Dict) -> None:
+        self._record("insert", command, data)
+
+    def update(self, command: str, data: Dict) -> None:
+        self._record("update", command, data)
+
+    def delete(self, command: str, data: Dict) -> None:
+        self._record("delete", command, data)
+
+
+class FakeStorage(CallRecorder, StorageInterface):
+    def get_file(self, file_to_be_downloaded: str, destination) -> None:
+        self._record("get_file", file_to_be_downloaded, destination)
+
+    def upload_content(self, file_key: str, content_to_be_uploaded: str) -> None:
+        self._record("upload_content", file_key, content_to_be_uploaded)
+
+
+class FakeIndex(CallRecorder, IndexInterface):
+    def create_index(self, index_name: str = "", body: Dict = {}) -> None:
+        self._record("create_index", index_name, body)
+
+    def refresh_index(self, index_name: str = "") -> None:
+        self._record("refresh_index", index_name)
+
+    def index_document(
+        self,
+        document: Dict,
+        document_id: Union[str, None] = None,
+        index: str = "",
+        refresh: bool = False,
+    ) -> None:
+        self._record("index_document", document, document_id, index, refresh)
+
+    def bulk_index(
+        self,
+        documents: List[Dict],
+        document_ids: List[str],
+        index: str = "",
+        refresh: bool = False,
+    ) -> List[str]:
+        self._record("bulk_index", documents, document_ids, index, refresh)
+        return []
+
+    def search(self, query: Dict, index: str = "") -> Dict:
+        self._record("search", query, index)
+        return {"hits": {"hits": []}}
+
+    def paginated_search(
+        self, query: Dict, index: str = "", keep_alive: str = "5m"
+    ) -> Iterable[Dict]:
+        self._record("paginated_search", query, index, keep_alive)
+        return []
+
+
+class FakeExtractor(CallRecorder, TextExtractorInterface):
+    def __init__(self, text: str = ""):
+        super().__init__()
+        self._text = text
+
+    def extract_text(self, filepath: str) -> str:
+        self._record("extract_text", filepath)
+        return self._text
@@ -230,6 +230,89 @@ class OpensearchBasicTests(TestCase):
         )
 
 
+class OpensearchBulkIndexTests(TestCase):
+    def setUp(self):
+        self.documents = [
+            {"file_checksum": "checksum-1", "source_text": "first"},
+            {"file_checksum": "checksum-2", "source_text": "second"},
+        ]
+        self.document_ids = ["checksum-1", "checksum-2"]
+
+    def expected_actions(self, index):
+        return [
+            {"_index": index, "_id": "checksum-1", "_source": self.documents[0]},
+            {"_index": index, "_id": "checksum-2", "_source": self.documents[1]},
+        ]
+
+    @patch("index.opensearch.helpers.bulk", return_value=(2, []))
+    @patch("opensearchpy.OpenSearch")
+    def test_bulk_index_documents(self, opensearch_mock, bulk_mock):
+        interface = OpenSearchInterface(["127.0.0.1"], "user", "password")
+
+        failed_ids = interface.bulk_index(
+            self.documents, self.document_ids, "querido-diario"
+        )
+
+        self.assertEqual(failed_ids, [])
+        bulk_mock.assert_called_once()
+        client, actions = bulk_mock.call_args.args
+        self.assertIs(client, opensearch_mock.return_value)
+        self.assertEqual(list(actions), self.expected_actions("querido-diario"))
+
+    @patch("index.opensearch.helpers.bulk", return_value=(2, []))
+    @patch("opensearchpy.OpenSearch")
+    def test_bulk_index_documents_using_default_index(self, opensearch_mock, bulk_mock):
+        interface = OpenSearchInterface(
+            ["127.0.0.1"], "user", "password", default_index="querido-diario2"
+        )
+
+        interface.bulk_index(self.documents, self.document_ids)
+
+        _, actions = bulk_mock.call_args.args
+        self.assertEqual(list(actions), self.expected_actions("querido-diario2"))
+
+    @patch("index.opensearch.helpers.bulk", return_value=(2, []))
+    @patch("opensearchpy.OpenSearch")
+    def test_bulk_index_should_forward_refresh_and_timeout(
+        self, opensearch_mock, bulk_mock
+    ):
+        interface = OpenSearchInterface(["127.0.0.1"], "user", "password", timeout=60)
+
+        interface.bulk_index(
+            self.documents, self.document_ids, "querido-diario", refresh=True
+        )
+
+        self.assertEqual(
+            bulk_mock.call_args.kwargs,
+            {"raise_on_error": False, "refresh": True, "request_timeout": 60},
+        )
+
+    @patch("index.opensearch.helpers.bulk")
+    @patch("opensearchpy.OpenSearch")
+    def test_bulk_index_should_return_rejected_document_ids(
+        self, opensearch_mock, bulk_mock
+    ):
+        bulk_mock.return_value = (
+            1,
+            [
+                {
+                    "index": {
+                        "_id": "checksum-2",
+                        "status": 400,
+                        "error": {"type": "mapper_parsing_exception"},
+                    }
+                }
+            ],
+        )
+        interface = OpenSearchInterface(["127.0.0.1"], "user", "password")
+
+        failed_ids = interface.bulk_index(
+            self.documents, self.document_ids, "querido-diario"
+        )
+
+        self.assertEqual(failed_ids, ["checksum-2"])
+
+
 class OpensearchIntegrationTests(TestCase):
     def setUp(self):
         document_checksum = str(uuid.uuid1())
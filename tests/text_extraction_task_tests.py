@@ -1,94 +1,207 @@
+import atexit
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, mock_open, patch
 import os
 import logging
 from datetime import date, datetime
-import tempfile
+import math
+import mmap
+import threading
 
 from tasks import (
-    extract_text_pending_gazettes,
-    upload_gazette_raw_text,
+    extract_text_from_gazettes,
     TextExtractorInterface,
 )
+from tasks.gazette_text_extraction import upload_raw_text
+from .fakes import FakeDatabase, FakeExtractor, FakeIndex, FakeStorage
 
+_FAKE_GAZETTE_FD = os.open("tests/data/fake_gazette.txt", os.O_RDONLY)
+_FAKE_GAZETTE = mmap.mmap(_FAKE_GAZETTE_FD, 0, prot=mmap.PROT_READ)
+os.close(_FAKE_GAZETTE_FD)
+atexit.register(_FAKE_GAZETTE.close)
+
+_ENVIRON = {
+    "QUERIDO_DIARIO_FILES_ENDPOINT": "http://test.com",
+    "TEXT_EXTRACTION_WORKERS": "1",
+}
+
+_NOW = datetime.now()
+
+_BASE = {
+    "id": 1,
+    "source_text": "",
+    "date": date(2020, 10, 18),
+    "edition_number": "1",
+    "is_extra_edition": False,
+    "power": "executive",
+    "file_checksum": "972aca2e-1174-11eb-b2d5-a86daaca905e",
+    "file_path": "sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.pdf",
+    "file_url": "www.querido-diario.org",
+    "scraped_at": _NOW,
+    "created_at": _NOW,
+    "territory_id": "3550308",
+    "processed": False,
+    "state_code": "SC",
+    "territory_name": "Gaspar",
+    "file_raw_txt": "http://test.com/sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.txt",
+}
+
+
+def make_gazettes(n, **overrides):
+    """
+    Builds n gazettes from the same template, with ids starting from 1 and a
+    distinct checksum and file path for each one
+    """
+    gazettes = []
+    for i in range(1, n + 1):
+        checksum = f"{i:08x}-1174-11eb-b2d5-a86daaca905e"
+        gazette = {
+            **_BASE,
+            "id": i,
+            "file_checksum": checksum,
+            "file_path": f"sc_gaspar/2020-10-18/{checksum}.pdf",
+            "file_raw_txt": f"http://test.com/sc_gaspar/2020-10-18/{checksum}.txt",
+            **overrides,
+        }
+        gazettes.append(gazette)
+    return gazettes
+
+
+class TextExtractionTaskTestCase(TestCase):
+    """
+    Fixtures shared by the text extraction task tests
+    """
 
-@patch.dict(
-    "os.environ",
-    {
-        "QUERIDO_DIARIO_FILES_ENDPOINT": "http://test.com",
-    },
-)
-class TextExtractionTaskTests(TestCase):
     def setUp(self):
+        self.data = make_gazettes(1)
+        self.territories = []
+
+    def create_mocks(self):
         self.database_mock = MagicMock()
-        self.data = [
-            {
-                "id": 1,
-                "source_text": "",
-                "date": date(2020, 10, 18),
-                "edition_number": "1",
-                "is_extra_edition": False,
-                "power": "executive",
-                "file_checksum": "972aca2e-1174-11eb-b2d5-a86daaca905e",
-                "file_path": "sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.pdf",
-                "file_url": "www.querido-diario.org",
-                "scraped_at": datetime.now(),
-                "created_at": datetime.now(),
-                "territory_id": "3550308",
-                "processed": False,
-                "state_code": "SC",
-                "territory_name": "Gaspar",
-                "file_raw_txt": "http://test.com/sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.txt",
-            }
-        ]
-        self.database_mock.get_pending_gazettes = MagicMock(return_value=self.data)
-        self.database_mock.set_gazette_as_processed = MagicMock()
         self.storage_mock = MagicMock()
-        self.storage_mock.get_file = MagicMock()
-        self.storage_mock.upload_content = MagicMock()
-        with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
-            self.tmpfile_returned_by_text_extraction_function_mock = tmpfile.name
+        self.index_mock = MagicMock()
+        self.index_mock.bulk_index.return_value = []
         self.text_extraction_function = MagicMock(spec=TextExtractorInterface)
         self.text_extraction_function.extract_text.return_value = ""
-        self.index_mock = MagicMock()
-        self.index_mock.index_document = MagicMock()
 
-    def tearDown(self):
-        if os.path.exists(self.tmpfile_returned_by_text_extraction_function_mock):
-            os.remove(self.tmpfile_returned_by_text_extraction_function_mock)
+    def mock_temporary_files(self):
+        """
+        Replaces the temporary files used by the task and their opening, so
+        nothing touches the disk
+        """
+        tmpfiles_patcher = patch("tasks.gazette_text_extraction.TempFilePool")
+        tmpfiles_class_mock = tmpfiles_patcher.start()
+        self.addCleanup(tmpfiles_patcher.stop)
+        tmpfiles = tmpfiles_class_mock.return_value.__enter__.return_value
+        tmpfiles.acquire.return_value = "gazette_file"
+        open_patcher = patch(
+            "tasks.gazette_text_extraction.open", mock_open(), create=True
+        )
+        self.open_mock = open_patcher.start()
+        self.addCleanup(open_patcher.stop)
 
-    def test_database_call(self):
-        extract_text_pending_gazettes(
-            self.database_mock,
+    def run_text_extraction(
+        self, data, text_extraction_function, database=None, **kwargs
+    ):
+        return extract_text_from_gazettes(
+            data,
+            self.territories,
+            database or self.database_mock,
             self.storage_mock,
             self.index_mock,
-            self.text_extraction_function,
+            text_extraction_function,
+            **kwargs,
         )
-        self.database_mock.get_pending_gazettes.assert_called_once()
 
-    def test_storage_call_to_get_file(self):
-        extract_text_pending_gazettes(
-            self.database_mock,
-            self.storage_mock,
-            self.index_mock,
-            self.text_extraction_function,
+    def file_should_not_exist(self, file_to_check):
+        self.assertFalse(
+            os.path.exists(file_to_check), msg=f"File {file_to_check} should be deleted"
+        )
+
+    def assert_called_twice(self, mock):
+        self.assertEqual(mock.call_count, 2, msg="Mock should be called twice")
+
+
+@patch.dict("os.environ", _ENVIRON)
+class TextExtractionTaskFakeTests(TextExtractionTaskTestCase):
+    """
+    Tests which only check calls, made against hand-rolled fakes instead of
+    mocks
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.mock_temporary_files()
+        self.fake_database = FakeDatabase()
+        self.fake_storage = FakeStorage()
+        self.fake_index = FakeIndex()
+        self.fake_extractor = FakeExtractor()
+
+    def run_text_extraction_with_fakes(self):
+        return extract_text_from_gazettes(
+            self.data,
+            self.territories,
+            self.fake_database,
+            self.fake_storage,
+            self.fake_index,
+            self.fake_extractor,
         )
 
+    def test_database_call(self):
+        self.run_text_extraction_with_fakes()
+        self.assertEqual(len(self.fake_database.calls_to("update")), 1)
+
+    def test_set_gazette_as_processed(self):
+        self.run_text_extraction_with_fakes()
+
+        (update_args,) = self.fake_database.calls_to("update")
+        self.assertEqual(
+            update_args[1],
+            {"id": 1, "file_checksum": self.data[0]["file_checksum"]},
+        )
+
+    def test_should_index_document(self):
+        self.run_text_extraction_with_fakes()
+        self.assertEqual(len(self.fake_index.calls_to("bulk_index")), 1)
+
+    def test_should_return_indexed_document_ids(self):
+        ids = self.run_text_extraction_with_fakes()
+        self.assertEqual(ids, [self.data[0]["file_checksum"]])
+
+    def test_upload_gazette_raw_text(self):
+        content = "some content"
+        upload_raw_text("some_file.txt", content, self.fake_storage)
+        self.assertEqual(
+            self.fake_storage.calls, [("upload_content", ("some_file.txt", content))]
+        )
+
+
+@patch.dict("os.environ", _ENVIRON)
+class TextExtractionTaskUnitTests(TextExtractionTaskTestCase):
+    """
+    Tests which only need the mocked interfaces. The temporary files and their
+    opening are mocked as well, so nothing touches the disk
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_mocks()
+        self.mock_temporary_files()
+
+    def test_storage_call_to_get_file(self):
+        self.run_text_extraction(self.data, self.text_extraction_function)
+
         self.storage_mock.get_file.assert_called_once()
         self.assertEqual(
             self.storage_mock.get_file.call_args.args[0], self.data[0]["file_path"]
         )
-        self.assertIsInstance(
-            self.storage_mock.get_file.call_args.args[1], tempfile._TemporaryFileWrapper
+        self.open_mock.assert_called_once_with("gazette_file", "wb")
+        self.assertIs(
+            self.storage_mock.get_file.call_args.args[1], self.open_mock.return_value
         )
 
     def test_text_extraction_function_call(self):
-        extract_text_pending_gazettes(
-            self.database_mock,
-            self.storage_mock,
-            self.index_mock,
-            self.text_extraction_function,
-        )
+        self.run_text_extraction(self.data, self.text_extraction_function)
 
         self.text_extraction_function.extract_text.assert_called_once()
         self.assertEqual(
@@ -98,82 +211,231 @@ class TextExtractionTaskTests(TestCase):
             self.text_extraction_function.extract_text.call_args.args[0], str
         )
 
-    def test_set_gazette_as_processed(self):
-        extract_text_pending_gazettes(
-            self.database_mock,
-            self.storage_mock,
-            self.index_mock,
-            self.text_extraction_function,
+    def _run(self, n, invalid_ids=()):
+        """
+        Processes n gazettes with 4 workers, failing the text extraction of the
+        gazettes in invalid_ids, and returns the gazettes along with what each
+        interface received
+        """
+        self.create_mocks()
+        gazettes = make_gazettes(n)
+        invalid_paths = {
+            gazette["file_path"] for gazette in gazettes if gazette["id"] in invalid_ids
+        }
+        # each worker downloads and extracts a gazette in the same thread
+        worker = threading.local()
+
+        def get_file(file_key, destination):
+            worker.file_key = file_key
+
+        def extract_text(filepath):
+            if worker.file_key in invalid_paths:
+                raise Exception("Unsupported file type")
+            return ""
+
+        self.storage_mock.get_file.side_effect = get_file
+        self.text_extraction_function.extract_text.side_effect = extract_text
+
+        ids = self.run_text_extraction(
+            gazettes, self.text_extraction_function, max_workers=4
         )
 
-        self.database_mock.set_gazette_as_processed.assert_called_once_with(
-            1, "972aca2e-1174-11eb-b2d5-a86daaca905e"
+        bulks = self.index_mock.bulk_index.call_args_list
+        return gazettes, {
+            "get_file": self.storage_mock.get_file.call_count,
+            "extract_text": self.text_extraction_function.extract_text.call_count,
+            "bulk_index": len(bulks),
+            "processed": [
+                call.args[1]["id"] for call in self.database_mock.update.call_args_list
+            ],
+            "indexed_documents": [
+                (document["id"], document["file_checksum"], document["file_path"])
+                for call in bulks
+                for document in call.args[0]
+            ],
+            "indexed_ids": [
+                document_id for call in bulks for document_id in call.args[1]
+            ],
+            "ids": ids,
+        }
+
+    def assert_only_valid_gazettes_processed(self, gazettes, calls, invalid_ids=()):
+        valid = [gazette for gazette in gazettes if gazette["id"] not in invalid_ids]
+        checksums = [gazette["file_checksum"] for gazette in valid]
+
+        self.assertEqual(calls["get_file"], len(gazettes))
+        self.assertEqual(calls["extract_text"], len(gazettes))
+        self.assertEqual(calls["bulk_index"], math.ceil(len(valid) / 100))
+        # the gazettes are indexed in the order their extractions finish
+        self.assertEqual(
+            sorted(calls["processed"]), [gazette["id"] for gazette in valid]
         )
+        self.assertEqual(
+            sorted(calls["indexed_documents"]),
+            [
+                (gazette["id"], gazette["file_checksum"], gazette["file_path"])
+                for gazette in valid
+            ],
+        )
+        self.assertEqual(
+            calls["indexed_ids"],
+            [checksum for _, checksum, _ in calls["indexed_documents"]],
+        )
+        self.assertEqual(sorted(calls["ids"]), checksums)
 
-    def test_should_index_document(self):
-        extract_text_pending_gazettes(
-            self.database_mock,
-            self.storage_mock,
-            self.index_mock,
-            self.text_extraction_function,
+    def test_batch_processing(self):
+        for n in (1, 2, 16, 128):
+            with self.subTest(n=n):
+                gazettes, calls = self._run(n)
+
+                self.assert_only_valid_gazettes_processed(gazettes, calls)
+
+    def test_batch_processing_with_invalid_files(self):
+        for n in (2, 16, 128):
+            with self.subTest(n=n):
+                invalid_ids = set(range(2, n + 1, 2))
+                gazettes, calls = self._run(n, invalid_ids)
+
+                self.assert_only_valid_gazettes_processed(gazettes, calls, invalid_ids)
+
+    def test_gazettes_should_be_pulled_as_they_are_processed(self):
+        max_workers = 4
+        pulled = []
+
+        def list_gazettes():
+            for gazette in make_gazettes(40):
+                pulled.append(gazette["id"])
+                yield gazette
+
+        lock = threading.Lock()
+        pulled_on_extraction = []
+
+        def extract_text(filepath):
+            with lock:
+                pulled_on_extraction.append(len(pulled))
+            return ""
+
+        self.text_extraction_function.extract_text.side_effect = extract_text
+
+        ids = self.run_text_extraction(
+            list_gazettes(), self.text_extraction_function, max_workers=max_workers
         )
-        self.index_mock.index_document.assert_called()
 
-    def copy_file_to_temporary_file(self, source_file):
-        with tempfile.NamedTemporaryFile(delete=False) as tmpfile:
-            with open(source_file, "r+b") as srcfile:
-                tmpfile.write(srcfile.read())
-            return tmpfile.name
+        self.assertEqual(len(pulled_on_extraction), 40)
+        for k, pulled_count in enumerate(pulled_on_extraction):
+            self.assertLessEqual(pulled_count, k + 2 * max_workers)
+        self.assertEqual(len(ids), 40)
 
-    def test_indexed_document_should_contain_gazette_content(self):
-        database_mock = MagicMock()
-        data = [
-            {
-                "id": 1,
-                "source_text": "",
-                "date": date(2020, 10, 18),
-                "edition_number": "1",
-                "is_extra_edition": False,
-                "power": "executive",
-                "file_checksum": "972aca2e-1174-11eb-b2d5-a86daaca905e",
-                "file_path": "tests/data/fake_gazette.txt",
-                "file_url": "www.querido-diario.org",
-                "scraped_at": datetime.now(),
-                "created_at": datetime.now(),
-                "territory_id": "3550308",
-                "processed": False,
-                "state_code": "SC",
-                "territory_name": "Gaspar",
-                "url": "http://test.com/tests/data/fake_gazette.txt",
-                "file_raw_txt": "http://test.com/tests/data/fake_gazette.txt",
-            }
-        ]
-        expected_data = data[0].copy()
-        with open("tests/data/fake_gazette.txt", "r") as f:
-            expected_data["source_text"] = f.read()
+    def test_slow_gazette_should_not_hold_back_the_others(self):
+        gazettes = make_gazettes(20)
+        others_extracted = threading.Event()
+        extracted = []
+        worker = threading.local()
+
+        def get_file(file_key, destination):
+            worker.file_key = file_key
+
+        def extract_text(filepath):
+            if worker.file_key == gazettes[0]["file_path"]:
+                if not others_extracted.wait(timeout=5):
+                    raise Exception("Other gazettes held back")
+            else:
+                extracted.append(worker.file_key)
+                if len(extracted) == len(gazettes) - 1:
+                    others_extracted.set()
+            return ""
 
-        database_mock.get_pending_gazettes = MagicMock(return_value=data)
-        database_mock.set_gazette_as_processed = MagicMock()
+        self.storage_mock.get_file.side_effect = get_file
+        self.text_extraction_function.extract_text.side_effect = extract_text
 
-        tmp_gazette_file = self.copy_file_to_temporary_file(
-            "tests/data/fake_gazette.txt"
+        ids = self.run_text_extraction(
+            gazettes, self.text_extraction_function, max_workers=4
         )
+
+        self.assertEqual(len(ids), 20)
+
+    def test_documents_should_be_indexed_in_bulks(self):
+        data = make_gazettes(5)
+
+        ids = self.run_text_extraction(data, self.text_extraction_function, bulk_size=2)
+
+        self.assertEqual(
+            [len(call.args[0]) for call in self.index_mock.bulk_index.call_args_list],
+            [2, 2, 1],
+        )
+        self.assertEqual(self.database_mock.update.call_count, 5)
+        self.assertEqual(len(ids), 5)
+
+    def test_gazettes_should_not_be_processed_when_bulk_index_fails(self):
+        self.index_mock.bulk_index.side_effect = Exception("Index unavailable")
+
+        ids = self.run_text_extraction(self.data, self.text_extraction_function)
+
+        self.database_mock.update.assert_not_called()
+        self.assertEqual(ids, [])
+
+    def test_rejected_document_should_only_skip_its_gazette(self):
+        data = [dict(_BASE, id=i, file_checksum=f"checksum-{i}") for i in range(1, 4)]
+        self.index_mock.bulk_index.return_value = ["checksum-2"]
+
+        ids = self.run_text_extraction(data, self.text_extraction_function)
+
+        self.index_mock.bulk_index.assert_called_once()
+        self.assertEqual(
+            sorted(
+                call.args[1]["id"] for call in self.database_mock.update.call_args_list
+            ),
+            [1, 3],
+        )
+        self.assertEqual(sorted(ids), ["checksum-1", "checksum-3"])
+
+    def test_database_failure_should_only_skip_its_gazette(self):
+        self.database_mock.update.side_effect = [Exception("db blip"), None, None]
+
+        ids = self.run_text_extraction(make_gazettes(3), self.text_extraction_function)
+
+        self.assertEqual(self.database_mock.update.call_count, 3)
+        self.assertEqual(len(ids), 2)
+
+    def test_gazette_url(self):
+        expected_data = self.data[0].copy()
+        expected_data["url"] = f"http://test.com/{expected_data['file_path']}"
+        expected_data["source_text"] = ""
+
+        self.run_text_extraction(self.data, self.text_extraction_function)
+        self.index_mock.bulk_index.assert_called_once_with(
+            [expected_data], [expected_data["file_checksum"]]
+        )
+
+
+@patch.dict("os.environ", _ENVIRON)
+class TextExtractionTaskIOTests(TextExtractionTaskTestCase):
+    """
+    Tests checking the files written down in the local disk
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_mocks()
+
+    def test_indexed_document_should_contain_gazette_content(self):
+        data = make_gazettes(
+            1,
+            file_path="tests/data/fake_gazette.txt",
+            url="http://test.com/tests/data/fake_gazette.txt",
+            file_raw_txt="http://test.com/tests/data/fake_gazette.txt",
+        )
+        expected_data = data[0].copy()
+        expected_data["source_text"] = _FAKE_GAZETTE[:].decode()
+
         text_extraction_function = MagicMock(spec=TextExtractorInterface)
         text_extraction_function.extract_text.return_value = expected_data[
             "source_text"
         ]
 
-        extract_text_pending_gazettes(
-            database_mock,
-            self.storage_mock,
-            self.index_mock,
-            text_extraction_function,
-        )
-        self.index_mock.index_document.assert_called_once_with(expected_data)
-
-    def file_should_not_exist(self, file_to_check):
-        self.assertFalse(
-            os.path.exists(file_to_check), msg=f"File {file_to_check} should be deleted"
+        self.run_text_extraction(data, text_extraction_function)
+        self.index_mock.bulk_index.assert_called_once_with(
+            [expected_data], [expected_data["file_checksum"]]
         )
 
     def test_invalid_file_type_should_be_skipped(self):
@@ -183,111 +445,60 @@ class TextExtractionTaskTests(TestCase):
             "Unsupported file type"
         )
 
-        extract_text_pending_gazettes(
-            self.database_mock,
-            self.storage_mock,
-            self.index_mock,
-            text_extraction_function,
-        )
+        ids = self.run_text_extraction(self.data, text_extraction_function)
         self.storage_mock.get_file.assert_called_once()
-        self.database_mock.get_pending_gazettes.assert_called_once()
-        self.database_mock.set_gazette_as_processed.assert_not_called()
-        self.index_mock.index_document.assert_not_called()
+        self.database_mock.update.assert_not_called()
+        self.index_mock.bulk_index.assert_not_called()
+        self.assertEqual(ids, [])
         self.file_should_not_exist(
             text_extraction_function.extract_text.call_args.args[0]
         )
 
-    def assert_called_twice(self, mock):
-        self.assertEqual(mock.call_count, 2, msg="Mock should be called twice")
-
     def test_invalid_file_type_should_be_skipped_and_valid_should_be_processed(self):
         database_mock = MagicMock()
-        data = [
-            {
-                "id": 1,
-                "source_text": "",
-                "date": date(2020, 10, 18),
-                "edition_number": "1",
-                "is_extra_edition": False,
-                "power": "executive",
-                "file_checksum": "972aca2e-1174-11eb-b2d5-a86daaca905e",
-                "file_path": "sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.pdf",
-                "file_url": "www.querido-diario.org",
-                "scraped_at": datetime.now(),
-                "created_at": datetime.now(),
-                "territory_id": "3550308",
-                "processed": False,
-                "state_code": "SC",
-                "territory_name": "Gaspar",
-                "url": "http://test.com/sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.pdf",
-                "file_raw_txt": "http://test.com/sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.txt",
-            },
-            {
-                "id": 2,
-                "source_text": "",
-                "date": date(2020, 10, 19),
-                "edition_number": "1",
-                "is_extra_edition": False,
-                "power": "executive",
-                "file_checksum": "972aca2e-1174-11eb-b2d5-a86daaca905e",
-                "file_path": "sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.pdf",
-                "file_url": "www.querido-diario.org",
-                "scraped_at": datetime.now(),
-                "created_at": datetime.now(),
-                "territory_id": "3550308",
-                "processed": False,
-                "state_code": "SC",
-                "territory_name": "Gaspar",
-                "url": "http://test.com/sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.pdf",
-                "file_raw_txt": "http://test.com/sc_gaspar/2020-10-18/972aca2e-1174-11eb-b2d5-a86daaca905e.txt",
-            },
-        ]
-        database_mock.get_pending_gazettes = MagicMock(return_value=data)
-        database_mock.set_gazette_as_processed = MagicMock()
-
-        file_content_returned_by_text_extraction_function_mock = None
-        with open("tests/data/fake_gazette.txt", "r") as f:
-            file_content_returned_by_text_extraction_function_mock = f.read()
+        data = [dict(_BASE, id=1), dict(_BASE, id=2, date=date(2020, 10, 19))]
 
         text_extraction_function = MagicMock(spec=TextExtractorInterface)
         text_extraction_function.extract_text.side_effect = [
             Exception("Unsupported file type"),
-            file_content_returned_by_text_extraction_function_mock,
+            _FAKE_GAZETTE[:].decode(),
         ]
 
-        extract_text_pending_gazettes(
-            database_mock,
-            self.storage_mock,
-            self.index_mock,
-            text_extraction_function,
-        )
+        self.run_text_extraction(data, text_extraction_function, database_mock)
 
-        database_mock.get_pending_gazettes.assert_called_once()
         self.assert_called_twice(self.storage_mock.get_file)
         self.assert_called_twice(text_extraction_function.extract_text)
-        database_mock.set_gazette_as_processed.assert_called_once()
-        self.index_mock.index_document.assert_called_once()
+        database_mock.update.assert_called_once()
+        self.assertEqual(database_mock.update.call_args.args[1]["id"], 2)
+        self.index_mock.bulk_index.assert_called_once()
+        self.assertEqual(len(self.index_mock.bulk_index.call_args.args[0]), 1)
         self.file_should_not_exist(
             text_extraction_function.extract_text.call_args.args[0]
         )
 
-    def test_gazette_url(self):
-        expected_data = self.data[0].copy()
-        expected_data["url"] = f"http://test.com/{expected_data['file_path']}"
+    def test_gazettes_should_reuse_the_same_temporary_file(self):
+        data = make_gazettes(2)
 
-        extract_text_pending_gazettes(
-            self.database_mock,
-            self.storage_mock,
-            self.index_mock,
-            self.text_extraction_function,
-        )
-        self.index_mock.index_document.assert_called_once_with(expected_data)
+        self.run_text_extraction(data, self.text_extraction_function)
 
-    def test_upload_gazette_raw_text(self):
-        content = "some content"
-        gazette = dict(file_path="some_file.pdf", source_text=content)
-        upload_gazette_raw_text(gazette, self.storage_mock)
-        self.assertEqual(gazette["file_raw_txt"], "http://test.com/some_file.txt")
-        self.storage_mock.upload_content.assert_called_once_with(
-            "some_file.txt", content
-        )
+        calls = self.text_extraction_function.extract_text.call_args_list
+        first_call, second_call = calls
+        self.assertEqual(first_call.args[0], second_call.args[0])
+        self.file_should_not_exist(first_call.args[0])
+
+    def test_temporary_file_should_be_reused_after_being_removed(self):
+        data = make_gazettes(2)
+        removed = []
+
+        def remove_first_file(file_key, destination):
+            if not removed:
+                os.remove(destination.name)
+                removed.append(destination.name)
+
+        self.storage_mock.get_file.side_effect = remove_first_file
+
+        ids = self.run_text_extraction(data, self.text_extraction_function)
+
+        calls = self.text_extraction_function.extract_text.call_args_list
+        self.assertEqual([call.args[0] for call in calls], removed * 2)
+        self.assertEqual(len(ids), 2)